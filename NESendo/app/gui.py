@@ -1,11 +1,15 @@
 """Qt GUI wrapper for NESendo NES emulator."""
 import sys
 import os
+import ctypes
 import threading
 import time
 import pickle
 import json
+import re
 import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -14,23 +18,214 @@ from PyQt5.QtWidgets import (
     QPushButton, QLabel, QFileDialog, QMessageBox, QFrame, QGridLayout,
     QGroupBox, QSlider, QSpinBox, QCheckBox, QComboBox, QTextEdit,
     QSplitter, QSizePolicy, QProgressBar, QStatusBar, QMenuBar, QMenu,
-    QAction, QToolBar, QTabWidget, QScrollArea, QButtonGroup, QDialog,
-    QDesktopWidget
+    QAction, QActionGroup, QToolBar, QTabWidget, QScrollArea, QButtonGroup, QDialog,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
-from PyQt5.QtCore import QTimer, QThread, pyqtSignal, Qt, QSize, QPropertyAnimation, QEasingCurve, QSettings, QIODevice
-from PyQt5.QtGui import QPixmap, QImage, QFont, QKeySequence, QPalette, QColor, QIcon, QPainter, QLinearGradient
+from PyQt5.QtCore import QEvent, QTimer, QElapsedTimer, QThread, QThreadPool, QRunnable, QObject, QMetaObject, Q_ARG, pyqtSignal, pyqtSlot, Qt, QSize, QPropertyAnimation, QEasingCurve, QSettings, QIODevice
+from PyQt5.QtGui import QPixmap, QImage, QImageReader, QFont, QKeySequence, QPalette, QColor, QIcon, QPainter, QLinearGradient
 from PyQt5.QtMultimedia import QAudioOutput, QAudioFormat, QAudioDeviceInfo
 
-from ..nes_env import NESEnv
+from ..nes_env import NESEnv, SCREEN_HEIGHT, SCREEN_WIDTH
+
+# Main window and settings dialog style sheets, defined once for the module
+_MAIN_QSS = """
+    QMainWindow {
+        background-color: #0f1419;
+        color: #cbd5e0;
+    }
+    QMenuBar {
+        background-color: #1a202c;
+        color: #cbd5e0;
+        border-bottom: 1px solid #2d3748;
+        font-size: 12px;
+    }
+    QMenuBar::item {
+        background-color: transparent;
+        padding: 4px 8px;
+    }
+    QMenuBar::item:selected {
+        background-color: #2d5a27;
+    }
+    QMenu {
+        background-color: #1a202c;
+        color: #cbd5e0;
+        border: 1px solid #2d3748;
+    }
+    QMenu::item:selected {
+        background-color: #2d5a27;
+    }
+"""
+
+_DIALOG_QSS = """
+    QDialog {
+        background-color: #0f1419;
+        color: #cbd5e0;
+    }
+    QTabWidget::pane {
+        border: 1px solid #2d3748;
+        background-color: #1a202c;
+    }
+    QTabBar::tab {
+        background-color: #2d3748;
+        color: #cbd5e0;
+        padding: 8px 16px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background-color: #2d5a27;
+    }
+    QCheckBox {
+        color: #cbd5e0;
+        font-size: 12px;
+    }
+    QLabel {
+        color: #cbd5e0;
+        font-size: 12px;
+    }
+    QSpinBox, QComboBox, QSlider, QTextEdit {
+        background-color: #1a202c;
+        border: 1px solid #2d3748;
+        color: #cbd5e0;
+        padding: 4px;
+    }
+    QPushButton {
+        background-color: #2d3748;
+        border: 1px solid #2d3748;
+        color: #cbd5e0;
+        padding: 6px 12px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #2d5a27;
+    }
+"""
+
+# Audio settings and state manager dialog style sheets
+_AUDIO_DIALOG_QSS = """
+    QDialog {
+        background-color: #0f1419;
+        color: #cbd5e0;
+    }
+    QGroupBox {
+        font-weight: bold;
+        font-size: 13px;
+        color: #cbd5e0;
+        border: 2px solid #2d3748;
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+    }
+    QLabel {
+        color: #cbd5e0;
+        font-size: 12px;
+    }
+    QCheckBox {
+        color: #cbd5e0;
+        font-size: 12px;
+    }
+    QSlider::groove:horizontal {
+        border: 1px solid #2d3748;
+        height: 8px;
+        background: #1a202c;
+        border-radius: 4px;
+    }
+    QSlider::handle:horizontal {
+        background: #2d5a27;
+        border: 1px solid #2d5a27;
+        width: 18px;
+        margin: -5px 0;
+        border-radius: 9px;
+    }
+    QSlider::handle:horizontal:hover {
+        background: #1a3d1a;
+    }
+    QComboBox {
+        background-color: #1a202c;
+        border: 1px solid #2d3748;
+        border-radius: 4px;
+        color: #cbd5e0;
+        padding: 4px;
+        font-size: 12px;
+    }
+    QComboBox:hover {
+        border-color: #2d5a27;
+    }
+    QPushButton {
+        background-color: #2d3748;
+        border: 1px solid #2d3748;
+        color: #cbd5e0;
+        padding: 6px 12px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #2d5a27;
+    }
+"""
+
+_STATE_DIALOG_QSS = """
+    QDialog {
+        background-color: #0f1419;
+        color: #cbd5e0;
+    }
+    QLabel {
+        color: #cbd5e0;
+        font-size: 12px;
+        font-weight: bold;
+    }
+    QTableWidget {
+        background-color: #1a202c;
+        border: 1px solid #2d3748;
+        border-radius: 4px;
+        color: #cbd5e0;
+        gridline-color: #2d3748;
+        font-size: 11px;
+    }
+    QTableWidget::item:selected {
+        background-color: #2d5a27;
+    }
+    QHeaderView::section {
+        background-color: #2d3748;
+        color: #cbd5e0;
+        border: none;
+        padding: 4px;
+        font-size: 11px;
+        font-weight: bold;
+    }
+    QPushButton {
+        background-color: #2d3748;
+        border: 1px solid #2d3748;
+        color: #cbd5e0;
+        padding: 6px 12px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #2d5a27;
+    }
+"""
+
+# Keys that still reach the window (menus, full screen) during emulation
+_PASSTHROUGH_KEYS = frozenset((Qt.Key_Escape, Qt.Key_F11, Qt.Key_Alt, Qt.Key_Control))
+
+# State files start with this magic, then a 4-byte little-endian header length,
+# a JSON header and the raw bytes of each array it lists
+_STATE_MAGIC = b'NESS\x01'
 
 
 class EmulationThread(QThread):
-    """Thread for running the NES emulation."""
+    """Thread for running the NES emulation.
+    
+    The emulator core is called through ctypes, which drops the GIL while
+    C++ runs a frame, so a thread is enough to keep the core off the GUI's
+    critical path while the GUI keeps direct access to ``env`` for states.
+    """
     
     frame_ready = pyqtSignal(object)  # Emits the screen frame
-    audio_ready = pyqtSignal(object)  # Emits audio data
     emulation_error = pyqtSignal(str)  # Emits error messages
-    fps_updated = pyqtSignal(float)  # Emits current FPS
     
     def __init__(self, rom_path: str):
         super().__init__()
@@ -41,16 +236,40 @@ class EmulationThread(QThread):
         self.fastforward = False
         self.fastforward_speed = 2.0  # Default 2x speed
         self.current_action = 0
+        # Set when the controller state changes, to cut the frame wait short
+        self.input_event = threading.Event()
         self.target_fps = 60
         self.frame_duration = 1.0 / self.target_fps
         
-        # FPS calculation variables
-        self.frame_count = 0
-        self.fps_start_time = time.time()
-        self.current_fps = 0.0
+        # Monotonic clock for frame pacing; all deadlines are integer ns
+        self._timer = QElapsedTimer()
+        
+        # Two packed RGB frames, alternated so the GUI can keep displaying
+        # (and zero-copy wrap) one while the next is being written
+        self._frame_buffers = [
+            np.empty((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8) for _ in range(2)
+        ]
+        self._frame_index = 0
+        # Set while an emitted frame is still queued for the GUI; frames
+        # produced meanwhile are dropped rather than piling up in the queue
+        self._frame_in_flight = False
+        
+        # Called from this thread with each frame's audio samples; the GUI
+        # queues them into the pull-mode audio source without a signal hop
+        self.audio_callback = None
+        # Reused for every frame's samples (~735 at 44.1 kHz); safe because
+        # the callback copies them out before the next frame is fetched
+        self._audio_scratch = np.empty(4096, dtype=np.float32)
+        # Fast-forward at or above this speed runs silent
+        self.fastforward_audio_limit = 4.0
+        
+        # Timestamps (ns) of the most recent frames for a rolling FPS estimate
+        self._frame_times = deque(maxlen=60)
         
     def run(self):
         """Main emulation loop."""
+        # Windows sleeps in ~15 ms scheduler ticks unless asked for 1 ms
+        self._set_timer_resolution(True)
         try:
             # Initialize the NES environment
             self.env = NESEnv(self.rom_path)
@@ -59,53 +278,77 @@ class EmulationThread(QThread):
             self.paused = False
             self.fastforward = False
             
-            last_frame_time = time.time()
+            self._timer.start()
+            last_frame_time = self._timer.nsecsElapsed()
             
             while self.running:
-                current_time = time.time()
-                
                 # Skip emulation step if paused
                 if self.paused:
-                    time.sleep(0.001)
+                    time.sleep(self.frame_duration)
+                    last_frame_time = self._timer.nsecsElapsed()
                     continue
                 
+                current_time = self._timer.nsecsElapsed()
+                
                 # Calculate frame duration based on fastforward state
                 current_frame_duration = self.frame_duration
                 if self.fastforward:
                     current_frame_duration = self.frame_duration / self.fastforward_speed
+                current_frame_duration = int(current_frame_duration * 1e9)
                 
-                # Frame rate limiting
-                if current_time - last_frame_time >= current_frame_duration:
-                    if self.env and not self.env.done:
-                        # Step the emulation
-                        _, _, terminated, truncated, _ = self.env.step(self.current_action)
-                        
-                        if terminated or truncated:
-                            self.env.reset()
-                        
-                        # Emit the current frame
-                        self.frame_ready.emit(self.env.screen)
-                        
-                        # Get and emit audio data (this clears the buffer to prevent overflow)
-                        audio_data = self.env.get_and_clear_audio_buffer()
-                        if audio_data is not None and len(audio_data) > 0:
-                            # Convert to numpy array for consistency
-                            audio_data = np.array(audio_data, dtype=np.float32)
-                            self.audio_ready.emit(audio_data)
-                        
-                        # Calculate and emit FPS
-                        self.frame_count += 1
-                        if self.frame_count % 30 == 0:  # Update FPS every 30 frames
-                            elapsed_time = current_time - self.fps_start_time
-                            if elapsed_time > 0:
-                                self.current_fps = self.frame_count / elapsed_time
-                                self.fps_updated.emit(self.current_fps)
-                        
+                # Frame rate limiting: sleep once until the next frame is due,
+                # but wake early on input so it lands in this frame rather
+                # than the one after. A frame only runs early within its own
+                # slot, so repeated input can't push emulation ahead of time.
+                remaining = last_frame_time + current_frame_duration - current_time
+                if remaining > 0:
+                    ahead = last_frame_time - current_time
+                    if ahead > 0:
+                        time.sleep(ahead / 1e9)
+                        continue
+                    if not self.input_event.wait(remaining / 1e9):
+                        continue
+                self.input_event.clear()
+                
+                if self.env and not self.env.done:
+                    # Step the emulation
+                    _, _, terminated, truncated, _ = self.env.step(self.current_action)
+                    
+                    if terminated or truncated:
+                        self.env.reset()
+                    
+                    # Emit the current frame from a numpy-owned copy; env.screen
+                    # views C++ memory that the next step overwrites and that
+                    # close() frees while queued frames may still be pending.
+                    # Skip it if the GUI hasn't taken the previous one yet.
+                    if not self._frame_in_flight:
+                        frame = self._frame_buffers[self._frame_index]
+                        self._frame_index ^= 1
+                        np.copyto(frame, self.env.screen)
+                        self._frame_in_flight = True
+                        self.frame_ready.emit(frame)
+                    
+                    # Get audio data (this clears the buffer to prevent overflow)
+                    audio_data = self.env.get_and_clear_audio_buffer(out=self._audio_scratch)
+                    if self.fastforward and self.fastforward_speed >= self.fastforward_audio_limit:
+                        audio_data = None
+                    if audio_data is not None and len(audio_data) > 0 and self.audio_callback:
+                        # Fast-forward produces speed-times the samples the
+                        # device plays; keep every n-th one so audio stays real time
+                        if self.fastforward and self.fastforward_speed >= 2:
+                            audio_data = audio_data[::int(self.fastforward_speed)]
+                        self.audio_callback(audio_data)
+                    
+                    # Record the frame time; the GUI polls get_fps() itself
+                    self._frame_times.append(current_time)
+                    
+                    # Advance the deadline by exactly one frame so sleep overshoot
+                    # doesn't accumulate, but don't try to catch up after a stall
+                    last_frame_time += current_frame_duration
+                    if current_time - last_frame_time > current_frame_duration:
                         last_frame_time = current_time
-                    else:
-                        time.sleep(0.001)  # Small sleep to prevent busy waiting
                 else:
-                    time.sleep(0.001)
+                    time.sleep(current_frame_duration / 1e9)
                     
         except Exception as e:
             self.emulation_error.emit(str(e))
@@ -113,10 +356,30 @@ class EmulationThread(QThread):
             if self.env:
                 self.env.close()
                 self.env = None
+            self._set_timer_resolution(False)
+    
+    @staticmethod
+    def _set_timer_resolution(enabled: bool):
+        """Request (or release) 1 ms scheduler granularity on Windows."""
+        if sys.platform != 'win32':
+            return
+        try:
+            winmm = ctypes.windll.winmm
+            if enabled:
+                winmm.timeBeginPeriod(1)
+            else:
+                winmm.timeEndPeriod(1)
+        except (AttributeError, OSError):
+            pass
+    
+    def frame_consumed(self, _frame=None):
+        """Allow the next frame to be emitted once the GUI has drawn this one."""
+        self._frame_in_flight = False
     
     def set_action(self, action: int):
         """Set the current controller action."""
         self.current_action = action
+        self.input_event.set()
     
     def set_fps(self, fps: int):
         """Set the target FPS."""
@@ -125,9 +388,15 @@ class EmulationThread(QThread):
     
     def reset_fps_calculation(self):
         """Reset FPS calculation variables."""
-        self.frame_count = 0
-        self.fps_start_time = time.time()
-        self.current_fps = 0.0
+        self._frame_times.clear()
+    
+    def get_fps(self) -> float:
+        """Return the frame rate measured over the most recent frames."""
+        frame_times = self._frame_times
+        if len(frame_times) < 2:
+            return 0.0
+        elapsed_ns = frame_times[-1] - frame_times[0]
+        return (len(frame_times) - 1) * 1e9 / elapsed_ns if elapsed_ns > 0 else 0.0
     
     def pause(self):
         """Pause the emulation."""
@@ -153,20 +422,57 @@ class EmulationThread(QThread):
         """Check if emulation is in fastforward mode."""
         return self.fastforward
     
-    def stop(self):
-        """Stop the emulation thread."""
+    def stop(self, wait: bool = True):
+        """Stop the emulation thread, waiting for it to exit unless ``wait`` is False."""
         self.running = False
-        self.wait()
+        # Wake the frame pacing wait so the loop sees the flag right away
+        self.input_event.set()
+        if wait:
+            self.wait()
+
+
+class LogoLoaderSignals(QObject):
+    """Signals for LogoLoader (QRunnable cannot emit signals itself)."""
+    
+    loaded = pyqtSignal(object, QImage)  # Emits (size key, decoded logo)
+
+
+class LogoLoader(QRunnable):
+    """Read and decode the logo off the GUI thread.
+    
+    The image is decoded straight to the size that fits ``max_size``, so the
+    full-resolution logo is never materialised. Only QImage may be used
+    outside the GUI thread; the receiver converts the result to a QPixmap.
+    """
+    
+    def __init__(self, path, key, max_size):
+        super().__init__()
+        self.path = path
+        self.key = key
+        self.max_size = max_size
+        self.signals = LogoLoaderSignals()
+    
+    def run(self):
+        """Decode the image and hand it back through a queued signal."""
+        reader = QImageReader(self.path)
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(self.max_size, Qt.KeepAspectRatio))
+        self.signals.loaded.emit(self.key, reader.read())
 
 
 class GameDisplayWidget(QLabel):
     """Widget for displaying the NES game screen."""
     
+    # Number of widget sizes to keep a rendered logo for
+    LOGO_CACHE_SIZE = 8
+    
     def __init__(self):
         super().__init__()
         # Set initial size to 2x scale
         self.setMinimumSize(256, 240)  # Minimum NES resolution
-        self.setScaledContents(True)
+        # Frames are scaled by the painter in paintEvent, not by QLabel
+        self.setScaledContents(False)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.setStyleSheet("""
             QLabel {
@@ -182,98 +488,148 @@ class GameDisplayWidget(QLabel):
         # Track if we're showing the logo (vs game content)
         self.showing_logo = True
         
+        # Frame geometry is fixed by the NES; RGB888 rows are 768 bytes,
+        # which keeps every scan-line 32-byte aligned for Qt's blitters
+        self._frame_width = SCREEN_WIDTH
+        self._frame_height = SCREEN_HEIGHT
+        self._bytes_per_line = SCREEN_WIDTH * 3
+        
+        # The latest frame and the array backing its pixels
+        self._frame_image = None
+        self._frame_data = None
+        # Packed RGB scratch for frames that arrive strided or with padding
+        self._rgb_buffer = np.empty((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
+        
+        # The logo is decoded in the background at each widget size it is
+        # shown at; results are cached per size. Only the background is
+        # painted until the first one arrives.
+        self._logo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'imgs', 'logo.png')
+        self._logo_cache = OrderedDict()
+        self._logo_pixmap = None
+        self._logo_key = None
+        self._logo_loaders = {}
+        
+        # Coalesce the burst of resize events from a window drag into one rescale
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(50)
+        self._resize_timer.timeout.connect(self.load_logo)
+        
         # Load and display the logo image instead of text
         self.load_logo()
         
         # Enable focus to capture keyboard input
         self.setFocusPolicy(Qt.StrongFocus)
     
+    def _set_logo_image(self, key, image):
+        """Cache a logo decoded by LogoLoader and display it if still wanted."""
+        self._logo_loaders.pop(key, None)
+        if image.isNull():
+            # Fallback to text if image loading fails
+            self.setText("No ROM loaded")
+            return
+        
+        # Remember the result, evicting the least recently used size
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(key[2])
+        self._logo_cache[key] = pixmap
+        if len(self._logo_cache) > self.LOGO_CACHE_SIZE:
+            self._logo_cache.popitem(last=False)
+        
+        if key == self._logo_key:
+            self._logo_pixmap = pixmap
+            self.update()
+    
     def load_logo(self):
         """Load and display the NESendo logo image."""
-        try:
-            # Get the path to the logo image
-            logo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'imgs', 'logo.png')
-            
-            # Load the image
-            pixmap = QPixmap(logo_path)
-            
-            if not pixmap.isNull():
-                # Get the widget size
-                widget_size = self.size()
-                widget_width = widget_size.width()
-                widget_height = widget_size.height()
-                
-                # Calculate the maximum size that fits within the widget while maintaining aspect ratio
-                # Leave some padding (10% on each side)
-                max_width = int(widget_width * 0.8)
-                max_height = int(widget_height * 0.8)
-                
-                # Scale the pixmap to fit within the maximum size while maintaining aspect ratio
-                scaled_pixmap = pixmap.scaled(
-                    max_width, max_height,
-                    Qt.KeepAspectRatio, 
-                    Qt.SmoothTransformation
-                )
-                
-                # Create a new pixmap with the widget size and transparent background
-                final_pixmap = QPixmap(widget_size)
-                final_pixmap.fill(Qt.transparent)
-                
-                # Create a painter to center the scaled logo
-                painter = QPainter(final_pixmap)
-                painter.setRenderHint(QPainter.Antialiasing)
-                
-                # Calculate the position to center the logo
-                x = (widget_width - scaled_pixmap.width()) // 2
-                y = (widget_height - scaled_pixmap.height()) // 2
-                
-                # Draw the scaled logo at the center
-                painter.drawPixmap(x, y, scaled_pixmap)
-                painter.end()
-                
-                self.setPixmap(final_pixmap)
-            else:
-                # Fallback to text if image loading fails
-                self.setText("No ROM loaded")
-        except Exception as e:
-            # Fallback to text if there's any error loading the image
-            self.setText("No ROM loaded")
+        # Calculate the maximum size that fits within the widget while maintaining aspect ratio
+        # Leave some padding (10% on each side)
+        max_width = max(1, int(self.width() * 0.8))
+        max_height = max(1, int(self.height() * 0.8))
+        # Decode at device pixels so the logo stays sharp on HiDPI screens
+        dpr = self.devicePixelRatioF()
+        key = (max_width, max_height, dpr)
+        self._logo_key = key
+        
+        # Reuse the scaled logo if this size was rendered before
+        scaled_pixmap = self._logo_cache.get(key)
+        if scaled_pixmap is not None:
+            self._logo_cache.move_to_end(key)
+            # paintEvent centers the cached pixmap, so no widget-sized
+            # composite has to be built and handed to setPixmap
+            self._logo_pixmap = scaled_pixmap
+            self.update()
+        elif key not in self._logo_loaders:
+            # Decode at this size in the background; the current logo stays
+            # up until _set_logo_image swaps in the new one
+            loader = LogoLoader(self._logo_path, key,
+                                QSize(int(max_width * dpr), int(max_height * dpr)))
+            loader.signals.loaded.connect(self._set_logo_image)
+            self._logo_loaders[key] = loader
+            QThreadPool.globalInstance().start(loader)
     
     def resizeEvent(self, event):
         """Handle widget resize events to update logo scaling."""
         super().resizeEvent(event)
-        # Reload logo with new size if we're currently showing the logo
+        # Reload logo with new size once resizing settles
         if self.showing_logo:
-            self.load_logo()
+            self._resize_timer.start()
         
     def update_frame(self, screen_data):
         """Update the display with new frame data."""
         if screen_data is not None:
             # Mark that we're no longer showing the logo
             self.showing_logo = False
+            self._resize_timer.stop()
             
-            # Convert numpy array to QImage
-            height, width, channels = screen_data.shape
-            bytes_per_line = channels * width
+            # The NES always delivers 256x240 frames; drop any padding channel
+            # with a view (a no-op for RGB) rather than branching per frame
+            data = screen_data[:, :, :3]
             
-            # Ensure the data is in the right format (RGB)
-            if channels == 3:
-                # Convert to bytes and ensure contiguous array
-                data = screen_data.astype('uint8').tobytes()
-                qimage = QImage(data, width, height, bytes_per_line, QImage.Format_RGB888)
-            else:
-                # Convert to RGB if needed
-                rgb_data = screen_data[:, :, :3] if channels >= 3 else screen_data
-                data = rgb_data.astype('uint8').tobytes()
-                qimage = QImage(data, width, height, bytes_per_line, QImage.Format_RGB888)
+            # QImage wraps the array memory directly, so only copy when the
+            # frame is not already packed uint8 (e.g. a strided view of the
+            # emulator's BGRx buffer rather than EmulationThread's buffers)
+            if data.dtype != np.uint8 or not data.flags['C_CONTIGUOUS']:
+                # Repack into one persistent buffer instead of a new array per
+                # frame (safe to overwrite: only this thread paints from it)
+                np.copyto(self._rgb_buffer, data, casting='unsafe')
+                data = self._rgb_buffer
+            # Keep the array alive for as long as the QImage points into it
+            self._frame_data = data
+            self._frame_image = QImage(data, self._frame_width, self._frame_height,
+                                       self._bytes_per_line, QImage.Format_RGB888)
             
-            # Convert to pixmap and display
-            pixmap = QPixmap.fromImage(qimage)
-            self.setPixmap(pixmap)
+            # Schedule a repaint; paintEvent scales the image to the widget
+            self.update()
+    
+    def paintEvent(self, event):
+        """Paint the latest frame scaled to fill the widget, or the logo."""
+        if self.showing_logo or self._frame_image is None:
+            # QLabel draws the background (and the fallback text) itself
+            super().paintEvent(event)
+            if self.showing_logo and self._logo_pixmap is not None:
+                painter = QPainter(self)
+                # Center using the pixmap's size in widget (logical) pixels
+                logo = self._logo_pixmap
+                dpr = logo.devicePixelRatio()
+                painter.drawPixmap(
+                    int(self.width() - logo.width() / dpr) // 2,
+                    int(self.height() - logo.height() / dpr) // 2,
+                    logo
+                )
+                painter.end()
+            return
+        
+        painter = QPainter(self)
+        painter.scale(self.width() / self._frame_width, self.height() / self._frame_height)
+        painter.drawImage(0, 0, self._frame_image)
+        painter.end()
     
     def show_logo(self):
         """Show the logo image (used when no ROM is loaded)."""
         self.showing_logo = True
+        self._frame_image = None
+        self._frame_data = None
         self.load_logo()
     
     def keyPressEvent(self, event):
@@ -457,16 +813,208 @@ class ControlPanel(QWidget):
     
 
 
+class NesAudioSource(QIODevice):
+    """Ring buffer of int16 samples that QAudioOutput pulls from.
+    
+    The emulation thread pushes each frame's samples; QAudioOutput reads them
+    on the AudioOutputWorker's thread, and the GUI thread may clear() the
+    ring. The lock is held only while copying in or out. Once
+    more than ``high_water`` samples are queued the oldest are dropped, so a
+    backlog turns into a skip instead of growing latency. A single block
+    larger than that (e.g. the test tone) is kept whole until it has played;
+    meanwhile at most ``high_water`` newer samples queue up behind it.
+    """
+    
+    def __init__(self, capacity: int, high_water: int, parent=None):
+        super().__init__(parent)
+        self.high_water = high_water
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+        self._read_pos = 0
+        self._size = 0
+        # Unplayed samples of an oversized block that must not be dropped
+        self._protected = 0
+        self._lock = threading.Lock()
+    
+    def push(self, samples):
+        """Queue int16 samples for playback."""
+        capacity = len(self._buffer)
+        if len(samples) > capacity:
+            samples = samples[-capacity:]
+        count = len(samples)
+        with self._lock:
+            if self._protected:
+                # An oversized block is still playing; drop the new samples
+                # that don't fit behind it rather than cutting it short
+                room = min(capacity, self._protected + self.high_water) - self._size
+                samples = samples[:max(0, room)]
+                count = len(samples)
+            else:
+                # Drop the oldest samples past the high-water mark, but keep
+                # all of a single block larger than it
+                overflow = self._size + count - min(capacity, max(self.high_water, count))
+                if overflow > 0:
+                    self._read_pos = (self._read_pos + overflow) % capacity
+                    self._size -= overflow
+                if count > self.high_water:
+                    self._protected = count
+            write_pos = (self._read_pos + self._size) % capacity
+            first = min(count, capacity - write_pos)
+            self._buffer[write_pos:write_pos + first] = samples[:first]
+            self._buffer[:count - first] = samples[first:]
+            self._size += count
+    
+    def clear(self):
+        """Drop all queued samples."""
+        with self._lock:
+            self._read_pos = 0
+            self._size = 0
+            self._protected = 0
+    
+    def readData(self, maxlen):
+        """Hand QAudioOutput up to ``maxlen`` bytes of queued samples.
+        
+        PyQt needs a bytes object back, so the one copy out of the ring is
+        unavoidable; memoryviews keep it to exactly one, even on wrap-around.
+        """
+        capacity = len(self._buffer)
+        with self._lock:
+            count = min(self._size, maxlen // 2)
+            start = self._read_pos
+            first = min(count, capacity - start)
+            if count > first:
+                data = b''.join((
+                    memoryview(self._buffer[start:]), memoryview(self._buffer[:count - first])
+                ))
+            else:
+                data = self._buffer[start:start + count].tobytes()
+            self._read_pos = (start + count) % capacity
+            self._size -= count
+            self._protected = max(0, self._protected - count)
+        return data
+    
+    def writeData(self, data):
+        """The source is read-only."""
+        return -1
+    
+    def bytesAvailable(self):
+        """Report queued samples so QAudioOutput knows data is ready."""
+        return self._size * 2 + super().bytesAvailable()
+    
+    def isSequential(self):
+        """Samples are consumed as they are read."""
+        return True
+
+
+class AudioOutputWorker(QObject):
+    """Owns the QAudioOutput on a dedicated audio thread.
+    
+    QAudioOutput pulls from its source on timers of the thread that created
+    it, so keeping it off the GUI thread stops window moves and repaints from
+    starving playback. Invoke the slots with queued calls from other threads.
+    """
+    
+    def __init__(self, audio_format, source, buffer_size: int, volume: float):
+        super().__init__()
+        self.audio_format = audio_format
+        self.buffer_size = buffer_size
+        self.volume = volume
+        self.audio_output = None
+        # Parent the source so it moves to the audio thread with the worker
+        self.source = source
+        self.source.setParent(self)
+    
+    @pyqtSlot()
+    def start(self):
+        """Create the output on this thread and start pulling from the source."""
+        try:
+            self.audio_output = QAudioOutput(self.audio_format, self)
+            self.audio_output.setVolume(self.volume)
+            self.audio_output.setBufferSize(self.buffer_size)
+            self.audio_output.start(self.source)
+            self._check_buffer_size()
+        except Exception as e:
+            print(f"Failed to start audio: {e}")
+            self.audio_output = None
+    
+    @pyqtSlot()
+    def stop(self):
+        """Stop playback."""
+        if self.audio_output:
+            self.audio_output.stop()
+            self.audio_output = None
+    
+    @pyqtSlot(float)
+    def set_volume(self, volume: float):
+        """Set the output volume."""
+        self.volume = volume
+        if self.audio_output:
+            self.audio_output.setVolume(volume)
+    
+    @pyqtSlot(int)
+    def set_buffer_size(self, buffer_size: int):
+        """Restart the output with a new device buffer size."""
+        # Restarting is an audible dropout, so only do it for a real change
+        if buffer_size == self.buffer_size:
+            return
+        self.buffer_size = buffer_size
+        if not self.audio_output:
+            return
+        
+        # The buffer size only applies when the output is started
+        self.audio_output.stop()
+        self.audio_output.setBufferSize(buffer_size)
+        self.audio_output.start(self.source)
+        self._check_buffer_size()
+    
+    def _check_buffer_size(self):
+        """Report when the backend ignored the requested buffer size."""
+        if self.audio_output.bufferSize() != self.buffer_size:
+            print(f"Audio buffer: requested {self.buffer_size} bytes, "
+                  f"got {self.audio_output.bufferSize()}")
+
+
 class NESendoGUI(QMainWindow):
     """Main GUI window for NESendo."""
     
+    # Full-scale samples map to +/-16384, a conservative NES-style level
+    AUDIO_SCALE = 16384
+    # One-pole low-pass y[i] = 0.8 * x[i] + 0.2 * y[i-1], applied as its
+    # impulse response truncated where 0.2**k drops below float32 precision.
+    # The kernel also applies AUDIO_SCALE, so filtering and scaling are one pass.
+    AUDIO_SMOOTHING = 0.2
+    AUDIO_SMOOTHING_TAPS = 16
+    AUDIO_SMOOTHING_KERNEL = (
+        AUDIO_SCALE * (1.0 - AUDIO_SMOOTHING) * AUDIO_SMOOTHING ** np.arange(AUDIO_SMOOTHING_TAPS)
+    ).astype(np.float32)
+    AUDIO_SMOOTHING_DECAY = (
+        AUDIO_SMOOTHING ** np.arange(1, AUDIO_SMOOTHING_TAPS + 1)
+    ).astype(np.float32)
+    
     def load_recent_files(self):
         """Load recent files from settings."""
         recent_files = self.settings.value('recent_files', [])
         if isinstance(recent_files, str):
             recent_files = [recent_files]
-        # Filter out files that no longer exist
-        return [f for f in recent_files if os.path.exists(f)]
+        # Filter out files that no longer exist, listing each parent
+        # directory once rather than stat-ing every entry. A name missing
+        # from the listing is still checked on disk, since the stored path
+        # may differ in case (Windows, macOS) or Unicode normalization
+        dir_entries = {}
+        for f in recent_files:
+            directory = os.path.dirname(f) or '.'
+            if directory not in dir_entries:
+                try:
+                    with os.scandir(directory) as entries:
+                        dir_entries[directory] = {
+                            entry.name for entry in entries
+                        }
+                except OSError:
+                    dir_entries[directory] = set()
+        return [
+            f for f in recent_files
+            if os.path.basename(f) in dir_entries[os.path.dirname(f) or '.']
+            or os.path.exists(f)
+        ]
     
     def save_recent_files(self):
         """Save recent files to settings."""
@@ -493,9 +1041,15 @@ class NESendoGUI(QMainWindow):
             for i, file_path in enumerate(self.recent_files):
                 file_name = os.path.basename(file_path)
                 action = QAction(f'&{i+1} {file_name}', self)
-                action.triggered.connect(lambda checked, path=file_path: self.load_recent_rom(path))
+                action.setData(file_path)
                 self.recent_menu.addAction(action)
     
+    def _on_recent_triggered(self, action):
+        """Load the ROM stored on a recent files menu entry."""
+        file_path = action.data()
+        if file_path:
+            self.load_recent_rom(file_path)
+    
     def load_recent_rom(self, file_path):
         """Load a ROM from the recent files list."""
         if os.path.exists(file_path):
@@ -534,14 +1088,31 @@ class NESendoGUI(QMainWindow):
         self.settings = QSettings('NESendo', 'NESendo')
         self.recent_files = self.load_recent_files()
         
+        # Audio settings dialog, created on first open
+        self._audio_settings_dialog = None
+        
+        # Combined menu and status bar height, see chrome_height()
+        self._chrome_height = None
+        
+        # Window resizes are applied at most once per frame while dragging
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self.apply_window_size)
+        
         # Audio settings
         self.audio_enabled = True
         self.master_volume = 0.75
-        self.audio_output = None
+        self.audio_thread = None
+        self.audio_worker = None
         self.audio_format = None
+        # Device buffer length in NES frames of audio at 1x speed
+        self.audio_buffer_frames = 3
         
         # State management
         self.state_slots = {}  # Dictionary to store state data for slots 1-4
+        # Status bar text for state_slots, rebuilt after set_state_slot/clear_states
+        self._state_status_text = None
         self.state_directory = os.path.join(os.path.expanduser("~"), ".nesendo", "states")
         self.ensure_state_directory()
         
@@ -551,6 +1122,17 @@ class NESendoGUI(QMainWindow):
         self.apply_dark_theme()
         self.init_audio()
         
+    @property
+    def rom_path(self) -> Optional[str]:
+        """Path of the loaded ROM, or None."""
+        return self._rom_path
+    
+    @rom_path.setter
+    def rom_path(self, path: Optional[str]):
+        """Set the ROM path and cache its base name for state file names."""
+        self._rom_path = path
+        self._rom_name = os.path.splitext(os.path.basename(path))[0] if path else None
+    
     def init_ui(self):
         """Initialize the user interface."""
         self.setWindowTitle("NESendo")
@@ -591,8 +1173,9 @@ class NESendoGUI(QMainWindow):
         load_action.triggered.connect(self.load_rom)
         file_menu.addAction(load_action)
         
-        # Load recent submenu
+        # Load recent submenu; entries carry their path as action data
         self.recent_menu = file_menu.addMenu('Load &Recent')
+        self.recent_menu.triggered.connect(self._on_recent_triggered)
         self.update_recent_menu()
         
         file_menu.addSeparator()
@@ -648,46 +1231,33 @@ class NESendoGUI(QMainWindow):
         # Fastforward speed submenu
         fastforward_menu = emu_menu.addMenu('Fast Forward &Speed')
         
-        self.speed_2x_action = QAction('&2x Speed', self)
-        self.speed_2x_action.setCheckable(True)
+        # One exclusive group dispatches every speed choice through a single slot
+        self.speed_action_group = QActionGroup(self)
+        self.speed_action_group.setExclusive(True)
+        self.speed_action_group.triggered.connect(self._on_speed_action_triggered)
+        for speed in (2.0, 4.0, 8.0):
+            action = QAction(f'&{int(speed)}x Speed', self)
+            action.setCheckable(True)
+            action.setData(speed)
+            self.speed_action_group.addAction(action)
+            fastforward_menu.addAction(action)
+        self.speed_2x_action, self.speed_4x_action, self.speed_8x_action = self.speed_action_group.actions()
         self.speed_2x_action.setChecked(True)  # Default speed
-        self.speed_2x_action.triggered.connect(lambda: self.set_fastforward_speed(2.0))
-        fastforward_menu.addAction(self.speed_2x_action)
-        
-        self.speed_4x_action = QAction('&4x Speed', self)
-        self.speed_4x_action.setCheckable(True)
-        self.speed_4x_action.triggered.connect(lambda: self.set_fastforward_speed(4.0))
-        fastforward_menu.addAction(self.speed_4x_action)
-        
-        self.speed_8x_action = QAction('&8x Speed', self)
-        self.speed_8x_action.setCheckable(True)
-        self.speed_8x_action.triggered.connect(lambda: self.set_fastforward_speed(8.0))
-        fastforward_menu.addAction(self.speed_8x_action)
         
         emu_menu.addSeparator()
         
         # Save State submenu
         save_state_menu = emu_menu.addMenu('&Save State')
         
-        save_state_1_action = QAction('Save State &1', self)
-        save_state_1_action.setShortcut('F1')
-        save_state_1_action.triggered.connect(lambda: self.save_state(1))
-        save_state_menu.addAction(save_state_1_action)
-        
-        save_state_2_action = QAction('Save State &2', self)
-        save_state_2_action.setShortcut('F2')
-        save_state_2_action.triggered.connect(lambda: self.save_state(2))
-        save_state_menu.addAction(save_state_2_action)
-        
-        save_state_3_action = QAction('Save State &3', self)
-        save_state_3_action.setShortcut('F3')
-        save_state_3_action.triggered.connect(lambda: self.save_state(3))
-        save_state_menu.addAction(save_state_3_action)
-        
-        save_state_4_action = QAction('Save State &4', self)
-        save_state_4_action.setShortcut('F4')
-        save_state_4_action.triggered.connect(lambda: self.save_state(4))
-        save_state_menu.addAction(save_state_4_action)
+        self.save_state_action_group = QActionGroup(self)
+        self.save_state_action_group.setExclusive(False)
+        self.save_state_action_group.triggered.connect(self._on_save_state_triggered)
+        for slot in range(1, 5):
+            action = QAction(f'Save State &{slot}', self)
+            action.setShortcut(f'F{slot}')
+            action.setData(slot)
+            self.save_state_action_group.addAction(action)
+            save_state_menu.addAction(action)
         
         save_state_menu.addSeparator()
         
@@ -701,25 +1271,15 @@ class NESendoGUI(QMainWindow):
         # Load State submenu
         load_state_menu = emu_menu.addMenu('&Load State')
         
-        load_state_1_action = QAction('Load State &1', self)
-        load_state_1_action.setShortcut('Shift+F1')
-        load_state_1_action.triggered.connect(lambda: self.load_state(1))
-        load_state_menu.addAction(load_state_1_action)
-        
-        load_state_2_action = QAction('Load State &2', self)
-        load_state_2_action.setShortcut('Shift+F2')
-        load_state_2_action.triggered.connect(lambda: self.load_state(2))
-        load_state_menu.addAction(load_state_2_action)
-        
-        load_state_3_action = QAction('Load State &3', self)
-        load_state_3_action.setShortcut('Shift+F3')
-        load_state_3_action.triggered.connect(lambda: self.load_state(3))
-        load_state_menu.addAction(load_state_3_action)
-        
-        load_state_4_action = QAction('Load State &4', self)
-        load_state_4_action.setShortcut('Shift+F4')
-        load_state_4_action.triggered.connect(lambda: self.load_state(4))
-        load_state_menu.addAction(load_state_4_action)
+        self.load_state_action_group = QActionGroup(self)
+        self.load_state_action_group.setExclusive(False)
+        self.load_state_action_group.triggered.connect(self._on_load_state_triggered)
+        for slot in range(1, 5):
+            action = QAction(f'Load State &{slot}', self)
+            action.setShortcut(f'Shift+F{slot}')
+            action.setData(slot)
+            self.load_state_action_group.addAction(action)
+            load_state_menu.addAction(action)
         
         # Add file-based save/load options
         load_state_menu.addSeparator()
@@ -790,6 +1350,18 @@ class NESendoGUI(QMainWindow):
         help_menu.addAction(about_action)
     
     
+    def _on_speed_action_triggered(self, action):
+        """Apply the fastforward speed stored on the triggered menu action."""
+        self.set_fastforward_speed(action.data())
+    
+    def _on_save_state_triggered(self, action):
+        """Save to the slot stored on the triggered menu action."""
+        self.save_state(action.data())
+    
+    def _on_load_state_triggered(self, action):
+        """Load from the slot stored on the triggered menu action."""
+        self.load_state(action.data())
+    
     def create_status_bar(self):
         """Create the status bar."""
         self.status_bar = QStatusBar()
@@ -815,6 +1387,11 @@ class NESendoGUI(QMainWindow):
         self.status_bar.addPermanentWidget(self.state_status_label)
         self.status_bar.addPermanentWidget(self.input_status_label)
         
+        # Poll the emulation FPS once a second instead of signalling per frame
+        self.fps_timer = QTimer(self)
+        self.fps_timer.setInterval(1000)
+        self.fps_timer.timeout.connect(self.refresh_fps_display)
+        
         self.setStatusBar(self.status_bar)
     
     def resize_to_fit_game(self):
@@ -823,13 +1400,9 @@ class NESendoGUI(QMainWindow):
         initial_width = 512
         initial_height = 480
         
-        # Calculate window decorations height
-        menu_height = self.menuBar().height()
-        status_height = self.status_bar.height()
-        
         # Calculate window size
         window_width = initial_width
-        window_height = initial_height + menu_height + status_height
+        window_height = initial_height + self.chrome_height()
         
         # Set the initial window size
         self.resize(window_width, window_height)
@@ -837,15 +1410,21 @@ class NESendoGUI(QMainWindow):
         # Center the window on screen
         self.center_window()
     
+    def chrome_height(self) -> int:
+        """Return the height of the menu and status bars, cached until the style changes."""
+        if self._chrome_height is None:
+            self._chrome_height = (
+                self.menuBar().sizeHint().height() + self.status_bar.sizeHint().height()
+            )
+        return self._chrome_height
+    
     def center_window(self):
         """Center the window on the screen."""
-        desktop = QDesktopWidget()
-        screen = desktop.screenGeometry()
-        size = self.geometry()
-        self.move(
-            (screen.width() - size.width()) // 2,
-            (screen.height() - size.height()) // 2
-        )
+        # Center the frame (title bar included) in the usable area of the
+        # screen the window is on
+        frame = self.frameGeometry()
+        frame.moveCenter(self.screen().availableGeometry().center())
+        self.move(frame.topLeft())
     
     def init_keymapping(self):
         """Initialize the keymapping system."""
@@ -861,9 +1440,8 @@ class NESendoGUI(QMainWindow):
             Qt.Key_Shift: 4,       # Select
         }
         
-        # Track pressed keys
-        self.pressed_keys = set()
-        
+        # Held buttons are tracked directly as the controller bitmask
+        self.current_action = 0
     
     def apply_dark_theme(self):
         """Apply dark theme to the main window."""
@@ -890,33 +1468,7 @@ class NESendoGUI(QMainWindow):
         app.setPalette(palette)
         
         # Set window styling
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0f1419;
-                color: #cbd5e0;
-            }
-            QMenuBar {
-                background-color: #1a202c;
-                color: #cbd5e0;
-                border-bottom: 1px solid #2d3748;
-                font-size: 12px;
-            }
-            QMenuBar::item {
-                background-color: transparent;
-                padding: 4px 8px;
-            }
-            QMenuBar::item:selected {
-                background-color: #2d5a27;
-            }
-            QMenu {
-                background-color: #1a202c;
-                color: #cbd5e0;
-                border: 1px solid #2d3748;
-            }
-            QMenu::item:selected {
-                background-color: #2d5a27;
-            }
-        """)
+        self.setStyleSheet(_MAIN_QSS)
         
     def setup_shortcuts(self):
         """Setup keyboard shortcuts."""
@@ -935,70 +1487,129 @@ class NESendoGUI(QMainWindow):
             self.audio_format.setByteOrder(QAudioFormat.LittleEndian)
             self.audio_format.setSampleType(QAudioFormat.SignedInt)
             
-            # Check if the format is supported
-            if not QAudioDeviceInfo.defaultOutputDevice().isFormatSupported(self.audio_format):
+            # Check if the format is supported; a device whose preferred
+            # format is exactly this one needs no further query
+            device_info = QAudioDeviceInfo.defaultOutputDevice()
+            if (device_info.preferredFormat() != self.audio_format
+                    and not device_info.isFormatSupported(self.audio_format)):
                 # Try a more compatible format
                 self.audio_format.setSampleRate(22050)
-                if not QAudioDeviceInfo.defaultOutputDevice().isFormatSupported(self.audio_format):
+                if not device_info.isFormatSupported(self.audio_format):
                     self.audio_format.setSampleRate(44100)
                     self.audio_format.setSampleSize(8)  # Fallback to 8-bit
             
-            # Create audio output with buffer size settings
-            self.audio_output = QAudioOutput(self.audio_format)
-            self.audio_output.setVolume(self.master_volume)
-            self.audio_output.setBufferSize(4096)  # Set buffer size for smoother playback
+            # Size the device buffer to a few NES frames rather than a fixed byte count
+            self.audio_buffer_size = self.audio_buffer_bytes()
+            
+            # Scratch buffers reused by play_audio; one second of samples
+            # covers every block the emulator sends, larger blocks regrow them.
+            # play_audio runs on the emulation thread and for the settings
+            # dialog's test tone on this one, so the lock guards the scratch.
+            self._audio_scratch_f32 = np.empty(self.audio_format.sampleRate(), dtype=np.float32)
+            self._audio_scratch_i16 = np.empty(self.audio_format.sampleRate(), dtype=np.int16)
+            self._audio_lock = threading.Lock()
+            # Last smoothing filter output, in int16 units
+            self._audio_filter_state = 0.0
+            
+            # Pull mode: QAudioOutput reads from the source as it needs data,
+            # which has room for a second of samples (e.g. the test tone) but
+            # keeps at most four frames of emulator audio queued.
+            # Unbuffered, so QIODevice doesn't read ahead from the ring into
+            # its own 16 KB buffer and add that much latency.
+            self.audio_source = NesAudioSource(
+                self.audio_format.sampleRate(), self.audio_format.sampleRate() // 60 * 4, self
+            )
+            self.audio_source.open(QIODevice.ReadOnly | QIODevice.Unbuffered)
             
-            # Initialize audio device
-            self.audio_device = None
+            # Create the audio output on its own thread
+            self.audio_worker = AudioOutputWorker(
+                self.audio_format, self.audio_source, self.audio_buffer_size, self.master_volume
+            )
+            self.audio_thread = QThread(self)
+            self.audio_worker.moveToThread(self.audio_thread)
+            self.audio_thread.started.connect(self.audio_worker.start)
+            self.audio_thread.start()
             
         except Exception as e:
             print(f"Failed to initialize audio: {e}")
-            self.audio_output = None
+            self.audio_worker = None
     
     def play_audio(self, audio_data):
-        """Play audio data."""
-        if not self.audio_enabled or not self.audio_output:
+        """Queue audio data for playback.
+        
+        Called directly from the emulation thread for every frame.
+        """
+        # Muting only zeroes the volume, so skip the work of filling the ring
+        if not self.audio_enabled or not self.audio_worker or self.master_volume <= 0.0:
             return
         
         try:
-            # Convert numpy array to bytes
-            if audio_data.dtype != np.int16:
-                # Apply gentle smoothing filter to reduce artifacts without over-filtering
-                audio_data = np.clip(audio_data, -1.0, 1.0)
-                
-                # Apply light smoothing to reduce high-frequency noise
-                if len(audio_data) > 1:
-                    # Single pass smoothing to preserve audio quality
-                    for i in range(1, len(audio_data)):
-                        audio_data[i] = 0.8 * audio_data[i] + 0.2 * audio_data[i-1]
-                
-                # Convert to int16 with proper NES-style scaling
-                audio_data = (audio_data * 16384).astype(np.int16)  # More conservative scaling
-            
-            # Initialize audio device if not already done
-            if self.audio_device is None:
-                self.audio_device = self.audio_output.start()
-            
-            # Write audio data directly without buffering to prevent overflow
-            if self.audio_device and self.audio_device.isOpen():
-                # Convert to bytes
-                audio_bytes = audio_data.tobytes()
+            with self._audio_lock:
+                # Convert numpy array to int16 samples
+                if audio_data.dtype != np.int16:
+                    n = len(audio_data)
+                    scratch_f32 = self._audio_scratch_f32
+                    scratch_i16 = self._audio_scratch_i16
+                    if n > len(scratch_f32):
+                        scratch_f32 = self._audio_scratch_f32 = np.empty(n, dtype=np.float32)
+                        scratch_i16 = self._audio_scratch_i16 = np.empty(n, dtype=np.int16)
+                    samples = scratch_f32[:n]
+                    
+                    # Apply gentle smoothing filter to reduce artifacts without over-filtering
+                    # (clipping into the float32 scratch also converts e.g. the
+                    # float64 test tone)
+                    np.clip(audio_data, -1.0, 1.0, out=samples)
+                    
+                    # Apply light smoothing to reduce high-frequency noise and
+                    # scale to int16 range in the same pass. The filter state
+                    # carries over from the previous block so block edges
+                    # don't click.
+                    if n:
+                        samples = self.smooth_audio(samples, self._audio_filter_state)
+                        self._audio_filter_state = samples[-1]
+                    
+                    # Convert to int16 straight into the int16 scratch
+                    # (truncating like astype)
+                    audio_data = scratch_i16[:n]
+                    np.copyto(audio_data, samples, casting='unsafe')
                 
-                # Write in smaller chunks to prevent audio dropouts
-                chunk_size = 1024  # Larger chunks for better performance
-                for i in range(0, len(audio_bytes), chunk_size):
-                    chunk = audio_bytes[i:i + chunk_size]
-                    if chunk:
-                        self.audio_device.write(chunk)
+                # The source copies the samples into its ring for QAudioOutput
+                self.audio_source.push(audio_data)
                 
         except Exception as e:
             print(f"Failed to play audio: {e}")
     
+    def smooth_audio(self, audio_data, previous):
+        """Low-pass ``audio_data`` and scale it by AUDIO_SCALE.
+        
+        ``previous`` is the (scaled) filter output before the first sample.
+        Equivalent to the recurrence in AUDIO_SMOOTHING, but run as a single
+        convolution rather than a Python loop over every sample.
+        """
+        smoothed = np.convolve(audio_data, self.AUDIO_SMOOTHING_KERNEL)[:len(audio_data)]
+        # Carry in the state from before this block; it decays within a few taps
+        head = min(len(smoothed), self.AUDIO_SMOOTHING_TAPS)
+        smoothed[:head] += self.AUDIO_SMOOTHING_DECAY[:head] * previous
+        return smoothed
+    
+    def audio_buffer_bytes(self) -> int:
+        """Return the device buffer size for ``audio_buffer_frames``.
+        
+        Fast-forward audio is decimated to real time, so the size doesn't
+        depend on the emulation speed.
+        """
+        samples_per_frame = self.audio_format.sampleRate() / 60
+        buffer_bytes = int(samples_per_frame * self.audio_buffer_frames) * 2
+        # Below ~1920 bytes most backends underrun constantly
+        return max(1920, buffer_bytes)
+    
     def set_audio_volume(self, volume):
         """Set the audio volume."""
         self.master_volume = max(0.0, min(1.0, volume))
-        if self.audio_output:
-            self.audio_output.setVolume(self.master_volume)
+        if self.audio_worker:
+            QMetaObject.invokeMethod(
+                self.audio_worker, 'set_volume', Qt.QueuedConnection, Q_ARG(float, self.master_volume)
+            )
         
         # Update emulator volume if running
         if self.emulation_thread and self.emulation_thread.env:
@@ -1028,56 +1639,41 @@ class NESendoGUI(QMainWindow):
         
     def keyPressEvent(self, event):
         """Handle key press events."""
-        # Only process game controls if emulation is running
-        if self.emulation_thread and self.emulation_thread.isRunning():
-            key = event.key()
-            if key in self.key_mapping:
-                self.pressed_keys.add(key)
-                self.update_action()
-                event.accept()  # Consume the event to prevent menu shortcuts
-                return
+        running = self.emulation_thread is not None and self.emulation_thread.isRunning()
+        bit = self.key_mapping.get(event.key())
+        
+        # Game controls while emulation is running; auto-repeat presses
+        # leave the mask unchanged
+        if running and bit:
+            if not self.current_action & bit:
+                self.current_action |= bit
+                self.emulation_thread.set_action(self.current_action)
+            event.accept()  # Consume the event to prevent menu shortcuts
+            return
         
-        # Allow certain keys to pass through for UI navigation
-        if event.key() in [Qt.Key_Escape, Qt.Key_F11, Qt.Key_Alt, Qt.Key_Control]:
+        # Allow certain keys to pass through for UI navigation, and consume
+        # all other keys during emulation
+        if not running or event.key() in _PASSTHROUGH_KEYS:
             super().keyPressEvent(event)
         else:
-            # Consume all other keys during emulation
-            if self.emulation_thread and self.emulation_thread.isRunning():
-                event.accept()
-            else:
-                super().keyPressEvent(event)
+            event.accept()
     
     def keyReleaseEvent(self, event):
         """Handle key release events."""
-        # Only process game controls if emulation is running
-        if self.emulation_thread and self.emulation_thread.isRunning():
-            key = event.key()
-            if key in self.key_mapping:
-                self.pressed_keys.discard(key)
-                self.update_action()
-                event.accept()  # Consume the event to prevent menu shortcuts
-                return
+        running = self.emulation_thread is not None and self.emulation_thread.isRunning()
+        bit = self.key_mapping.get(event.key())
+        
+        if running and bit:
+            if self.current_action & bit:
+                self.current_action &= ~bit
+                self.emulation_thread.set_action(self.current_action)
+            event.accept()  # Consume the event to prevent menu shortcuts
+            return
         
-        # Allow certain keys to pass through for UI navigation
-        if event.key() in [Qt.Key_Escape, Qt.Key_F11, Qt.Key_Alt, Qt.Key_Control]:
+        if not running or event.key() in _PASSTHROUGH_KEYS:
             super().keyReleaseEvent(event)
         else:
-            # Consume all other keys during emulation
-            if self.emulation_thread and self.emulation_thread.isRunning():
-                event.accept()
-            else:
-                super().keyReleaseEvent(event)
-    
-    def update_action(self):
-        """Update the current controller action based on pressed keys."""
-        action = 0
-        for key in self.pressed_keys:
-            if key in self.key_mapping:
-                action |= self.key_mapping[key]
-        
-        self.current_action = action
-        if self.emulation_thread:
-            self.emulation_thread.set_action(action)
+            event.accept()
     
     def focusInEvent(self, event):
         """Handle focus in events."""
@@ -1141,12 +1737,17 @@ class NESendoGUI(QMainWindow):
                 self.emulation_thread.wait(1000)  # Wait up to 1 second
         
         try:
+            # A new thread starts with no buttons held; drop any left in the
+            # mask by keys released while emulation was stopped
+            self.current_action = 0
+            
             # Create and start emulation thread
             self.emulation_thread = EmulationThread(self.rom_path)
             self.emulation_thread.frame_ready.connect(self.game_display.update_frame)
-            self.emulation_thread.audio_ready.connect(self.play_audio)
+            # Connected after update_frame so it runs once the frame is taken
+            self.emulation_thread.frame_ready.connect(self.emulation_thread.frame_consumed)
+            self.emulation_thread.audio_callback = self.play_audio
             self.emulation_thread.emulation_error.connect(self.handle_emulation_error)
-            self.emulation_thread.fps_updated.connect(self.update_fps_display)
             self.emulation_thread.start()
             
             # Load existing states for this ROM (disabled to prevent segfaults)
@@ -1169,8 +1770,9 @@ class NESendoGUI(QMainWindow):
             # Set focus to game display to capture keyboard input
             self.game_display.setFocus()
             
-            # Reset FPS calculation
+            # Reset FPS calculation and start polling it
             self.emulation_thread.reset_fps_calculation()
+            self.fps_timer.start()
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to start emulation: {str(e)}")
@@ -1183,12 +1785,14 @@ class NESendoGUI(QMainWindow):
             if self.emulation_thread.isRunning():
                 self.emulation_thread.wait(2000)  # Wait up to 2 seconds
             self.emulation_thread = None
+            # Releases aren't tracked while stopped, so forget held buttons
+            self.current_action = 0
+            self.fps_timer.stop()
             
-            # Clean up audio to stop any playing audio
-            if self.audio_output:
-                self.audio_output.stop()
-            if self.audio_device:
-                self.audio_device = None
+            # Drop queued audio to stop any playing audio
+            if self.audio_worker:
+                self.audio_source.clear()
+                self._audio_filter_state = 0.0
             
             # Show logo instead of text
             self.game_display.show_logo()
@@ -1276,6 +1880,11 @@ class NESendoGUI(QMainWindow):
         """Update the FPS display with current FPS."""
         self.fps_status_label.setText(f"FPS: {current_fps:.1f}")
     
+    def refresh_fps_display(self):
+        """Poll the emulation thread's rolling FPS and show it."""
+        if self.emulation_thread:
+            self.update_fps_display(self.emulation_thread.get_fps())
+    
     def update_scale(self, scale_text):
         """Update the display scale."""
         scale = int(scale_text[0])  # Extract number from "2x", "3x", etc.
@@ -1284,10 +1893,8 @@ class NESendoGUI(QMainWindow):
         new_height = 240 * scale
         
         # Resize the window to accommodate the new scale
-        menu_height = self.menuBar().height()
-        status_height = self.status_bar.height()
         window_width = new_width
-        window_height = new_height + menu_height + status_height
+        window_height = new_height + self.chrome_height()
         
         self.resize(window_width, window_height)
         self.scale_status_label.setText(f"Scale: {scale_text}")
@@ -1491,49 +2098,7 @@ class NESendoGUI(QMainWindow):
         dialog.setLayout(layout)
         
         # Apply midnight dark theme to dialog
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: #0f1419;
-                color: #cbd5e0;
-            }
-            QTabWidget::pane {
-                border: 1px solid #2d3748;
-                background-color: #1a202c;
-            }
-            QTabBar::tab {
-                background-color: #2d3748;
-                color: #cbd5e0;
-                padding: 8px 16px;
-                margin-right: 2px;
-            }
-            QTabBar::tab:selected {
-                background-color: #2d5a27;
-            }
-            QCheckBox {
-                color: #cbd5e0;
-                font-size: 12px;
-            }
-            QLabel {
-                color: #cbd5e0;
-                font-size: 12px;
-            }
-            QSpinBox, QComboBox, QSlider, QTextEdit {
-                background-color: #1a202c;
-                border: 1px solid #2d3748;
-                color: #cbd5e0;
-                padding: 4px;
-            }
-            QPushButton {
-                background-color: #2d3748;
-                border: 1px solid #2d3748;
-                color: #cbd5e0;
-                padding: 6px 12px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #2d5a27;
-            }
-        """)
+        dialog.setStyleSheet(_DIALOG_QSS)
         
         if dialog.exec_() == QDialog.Accepted:
             # Apply settings
@@ -1542,7 +2107,11 @@ class NESendoGUI(QMainWindow):
     
     def show_audio_settings(self):
         """Show audio settings dialog."""
-        dialog = AudioSettingsDialog(self)
+        # Build the dialog once and reuse it, showing the current settings
+        if self._audio_settings_dialog is None:
+            self._audio_settings_dialog = AudioSettingsDialog(self)
+        dialog = self._audio_settings_dialog
+        dialog.load_settings()
         if dialog.exec_() == QDialog.Accepted:
             # Apply audio settings
             self.set_audio_enabled(dialog.enable_audio_checkbox.isChecked())
@@ -1569,7 +2138,7 @@ class NESendoGUI(QMainWindow):
         if slot is None:
             return None
             
-        rom_name = os.path.splitext(os.path.basename(self.rom_path))[0] if self.rom_path else "unknown"
+        rom_name = self._rom_name or "unknown"
         return os.path.join(self.state_directory, f"{rom_name}_slot_{slot}.state")
     
     def save_state(self, slot: int):
@@ -1586,7 +2155,7 @@ class NESendoGUI(QMainWindow):
             state_data = self.capture_emulator_state()
             
             # Save to slot
-            self.state_slots[slot] = state_data
+            self.set_state_slot(slot, state_data)
             
             # Save to file
             filename = self.get_state_filename(slot)
@@ -1639,10 +2208,9 @@ class NESendoGUI(QMainWindow):
         # Capture all the necessary state data
         state_data = {
             'rom_path': self.rom_path,
-            'screen': env.screen.copy() if hasattr(env, 'screen') else None,
-            'ram': env.ram.copy() if hasattr(env, 'ram') else None,
-            'controllers': [env.controllers[0].copy(), env.controllers[1].copy()] if hasattr(env, 'controllers') else None,
-            'done': env.done if hasattr(env, 'done') else False,
+            'ram': env.ram.copy(),
+            'controllers': [env.controllers[0].copy(), env.controllers[1].copy()],
+            'done': env.done,
             'timestamp': time.time()
         }
         
@@ -1687,71 +2255,141 @@ class NESendoGUI(QMainWindow):
             print(f"Warning: Could not restore some state data: {e}")
     
     def save_state_to_file(self, state_data: Dict[str, Any], filename: str):
-        """Save state data to a file."""
-        # Create a serializable version of the state
-        serializable_state = {
+        """Save state data to a file.
+        
+        The arrays are written as raw bytes after a JSON header describing
+        them, see ``_STATE_MAGIC``.
+        """
+        arrays = {}
+        if state_data['ram'] is not None:
+            arrays['ram'] = state_data['ram']
+        if state_data['controllers']:
+            arrays['ctrl0'], arrays['ctrl1'] = state_data['controllers']
+        
+        header = json.dumps({
             'rom_path': state_data['rom_path'],
-            'ram': state_data['ram'].tolist() if state_data['ram'] is not None else None,
-            'controllers': [state_data['controllers'][0].tolist(), state_data['controllers'][1].tolist()] if state_data['controllers'] else None,
-            'done': state_data['done'],
+            'done': bool(state_data['done']),
             'timestamp': state_data['timestamp'],
-            'version': '1.0'
-        }
+            'arrays': [[name, a.dtype.str, a.shape] for name, a in arrays.items()]
+        }).encode()
+        
+        # Write a temporary file and swap it in, so a crash never leaves a
+        # truncated state behind
+        tmp_filename = filename + '.tmp'
+        try:
+            with open(tmp_filename, 'wb') as f:
+                # The arrays go straight into the file buffer without a tobytes()
+                # copy; the buffered writer still issues a single write for them
+                f.writelines([
+                    _STATE_MAGIC, len(header).to_bytes(4, 'little'), header,
+                    *(np.ascontiguousarray(a).data for a in arrays.values())
+                ])
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            # Don't leave a partial temporary file next to the slot files
+            try:
+                os.unlink(tmp_filename)
+            except OSError:
+                pass
+            raise
+    
+    def save_all_slots_to_dir(self, directory: str) -> int:
+        """Export every numbered state slot to a directory, returning the count.
+        
+        The files are independent, so they are written in parallel; file
+        writes and fsync release the GIL.
+        """
+        slots = [slot for slot in self.state_slots if slot > 0]
+        if not slots:
+            return 0
         
-        with open(filename, 'wb') as f:
-            pickle.dump(serializable_state, f)
+        def save_slot(slot):
+            filename = os.path.basename(self.get_state_filename(slot))
+            self.save_state_to_file(self.state_slots[slot], os.path.join(directory, filename))
+        
+        with ThreadPoolExecutor(max_workers=min(4, len(slots))) as executor:
+            # Consume the results so a failed write raises here
+            list(executor.map(save_slot, slots))
+        return len(slots)
     
     def load_state_from_file(self, filename: str) -> Dict[str, Any]:
         """Load state data from a file."""
         try:
             with open(filename, 'rb') as f:
-                serializable_state = pickle.load(f)
+                data = f.read()
+            
+            if data.startswith(_STATE_MAGIC):
+                return self._parse_state(memoryview(data))
+            
+            # Anything without the magic is a legacy pickled state
+            serializable_state = pickle.loads(data)
             
-            # Convert back to numpy arrays with error handling
-            state_data = {
+            # Older states stored the arrays as plain lists
+            ram = serializable_state.get('ram')
+            controllers = serializable_state.get('controllers')
+            return {
                 'rom_path': serializable_state.get('rom_path'),
-                'ram': None,
-                'controllers': None,
+                'ram': None if ram is None else np.asarray(ram, dtype=np.uint8),
+                'controllers': (
+                    None if controllers is None
+                    else [np.asarray(c, dtype=np.uint8) for c in controllers[:2]]
+                ),
                 'done': serializable_state.get('done', False),
                 'timestamp': serializable_state.get('timestamp', 0)
             }
             
-            # Safely convert RAM data
-            if serializable_state.get('ram') is not None:
-                try:
-                    state_data['ram'] = np.array(serializable_state['ram'])
-                except Exception as e:
-                    print(f"Warning: Could not convert RAM data: {e}")
-                    state_data['ram'] = None
-            
-            # Safely convert controller data
-            if serializable_state.get('controllers') is not None:
-                try:
-                    state_data['controllers'] = [
-                        np.array(serializable_state['controllers'][0]),
-                        np.array(serializable_state['controllers'][1])
-                    ]
-                except Exception as e:
-                    print(f"Warning: Could not convert controller data: {e}")
-                    state_data['controllers'] = None
-            
-            return state_data
-            
         except Exception as e:
             print(f"Error loading state file {filename}: {e}")
             raise
     
+    @staticmethod
+    def _parse_state(data: memoryview) -> Dict[str, Any]:
+        """Decode a state file written by ``save_state_to_file``.
+        
+        The arrays are read-only views of ``data``; nothing writes to them.
+        """
+        offset = len(_STATE_MAGIC) + 4
+        header_len = int.from_bytes(data[len(_STATE_MAGIC):offset], 'little')
+        header = json.loads(bytes(data[offset:offset + header_len]))
+        offset += header_len
+        
+        arrays = {}
+        for name, dtype, shape in header['arrays']:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(data, dtype, count, offset).reshape(shape)
+            offset += count * dtype.itemsize
+        
+        return {
+            'rom_path': header.get('rom_path'),
+            'ram': arrays.get('ram'),
+            'controllers': [arrays['ctrl0'], arrays['ctrl1']] if 'ctrl0' in arrays else None,
+            'done': header.get('done', False),
+            'timestamp': header.get('timestamp', 0)
+        }
+    
+    def set_state_slot(self, slot: int, state_data: Dict[str, Any]):
+        """Store captured state data in a slot."""
+        if slot not in self.state_slots:
+            self._state_status_text = None
+        self.state_slots[slot] = state_data
+    
     def update_state_status(self):
         """Update the state status indicator in the status bar."""
-        if not self.state_slots:
-            self.state_status_label.setText("States: --")
-        else:
-            slots = sorted(self.state_slots.keys())
-            self.state_status_label.setText(f"States: {', '.join(map(str, slots))}")
+        if self._state_status_text is None:
+            if not self.state_slots:
+                self._state_status_text = "States: --"
+            else:
+                slots = sorted(self.state_slots.keys())
+                self._state_status_text = f"States: {', '.join(map(str, slots))}"
+            self.state_status_label.setText(self._state_status_text)
     
     def clear_states(self):
         """Clear all saved states."""
         self.state_slots.clear()
+        self._state_status_text = None
         self.update_state_status()
     
     def load_existing_states(self):
@@ -1759,18 +2397,30 @@ class NESendoGUI(QMainWindow):
         if not self.rom_path:
             return
         
-        rom_name = os.path.splitext(os.path.basename(self.rom_path))[0]
+        # One directory scan instead of probing every slot path
+        slot_pattern = re.compile(rf"{re.escape(self._rom_name)}_slot_(\d+)\.state$")
+        prefix = f"{self._rom_name}_slot_"
+        slot_files = {}
+        try:
+            with os.scandir(self.state_directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(prefix):
+                        continue
+                    match = slot_pattern.match(entry.name)
+                    if match and entry.is_file():
+                        slot_files[int(match.group(1))] = entry.path
+        except OSError:
+            return
         
-        # Check for existing state files
-        for slot in range(1, 5):
-            filename = os.path.join(self.state_directory, f"{rom_name}_slot_{slot}.state")
-            if os.path.exists(filename):
-                try:
-                    state_data = self.load_state_from_file(filename)
-                    self.state_slots[slot] = state_data
-                except Exception as e:
-                    # If loading fails, just skip this slot
-                    print(f"Failed to load state slot {slot}: {e}")
+        for slot, filename in sorted(slot_files.items()):
+            if not 1 <= slot <= 4:
+                continue
+            try:
+                state_data = self.load_state_from_file(filename)
+                self.set_state_slot(slot, state_data)
+            except Exception as e:
+                # If loading fails, just skip this slot
+                print(f"Failed to load state slot {slot}: {e}")
         
         self.update_state_status()
     
@@ -1782,8 +2432,7 @@ class NESendoGUI(QMainWindow):
         
         # Get default filename based on current ROM
         if self.rom_path:
-            rom_name = os.path.splitext(os.path.basename(self.rom_path))[0]
-            default_filename = f"{rom_name}_savestate.state"
+            default_filename = f"{self._rom_name}_savestate.state"
         else:
             default_filename = "savestate.state"
         
@@ -1808,7 +2457,7 @@ class NESendoGUI(QMainWindow):
                 
                 # Also store in a temporary slot for full restoration capability
                 # Use slot 0 as a temporary slot for file-based states
-                self.state_slots[0] = state_data
+                self.set_state_slot(0, state_data)
                 
                 # Show success message
                 self.status_bar.showMessage(f"State saved to {os.path.basename(file_path)}", 3000)
@@ -1852,7 +2501,7 @@ class NESendoGUI(QMainWindow):
                 
                 # Store the loaded state in temporary slot 0
                 # This allows us to use the C++ restore mechanism
-                self.state_slots[0] = state_data
+                self.set_state_slot(0, state_data)
                 
                 # Use the same mechanism as quick loads
                 # This will restore the most recent C++ backup
@@ -1875,37 +2524,54 @@ class NESendoGUI(QMainWindow):
     def showEvent(self, event):
         """Handle window show events."""
         super().showEvent(event)
+        # Measure the bars again now that they are laid out and styled
+        self._chrome_height = None
         # Resize to fit game display when window is shown
         self.resize_to_fit_game()
     
+    def changeEvent(self, event):
+        """Handle style and font changes."""
+        super().changeEvent(event)
+        if event.type() in (QEvent.StyleChange, QEvent.FontChange):
+            self._chrome_height = None
+    
     def resizeEvent(self, event):
         """Handle window resize events."""
         super().resizeEvent(event)
-        # Make the game display fill the available space
-        if hasattr(self, 'game_display'):
-            # Get the available space (window size minus menu and status bar)
-            menu_height = self.menuBar().height()
-            status_height = self.status_bar.height()
-            available_width = self.width()
-            available_height = self.height() - menu_height - status_height
-            
-            # Resize game display to fill the available space while maintaining aspect ratio
-            self.resize_game_display_with_aspect_ratio(available_width, available_height)
-            
-            # Update scale status based on current size
-            self.update_scale_status()
+        if not self._resize_timer.isActive():
+            self._resize_timer.start()
+    
+    def apply_window_size(self):
+        """Fit the game display to the current window size."""
+        # Get the available space (window size minus menu and status bar)
+        available_width = self.width()
+        available_height = self.height() - self.chrome_height()
+        
+        # Resize game display to fill the available space while maintaining aspect ratio
+        self.resize_game_display_with_aspect_ratio(available_width, available_height)
+        
+        # Update scale status based on current size
+        self.update_scale_status()
     
     def closeEvent(self, event):
         """Handle window close event."""
-        if self.emulation_thread:
-            self.emulation_thread.stop()
+        # Let the emulation thread wind down while audio is released; it is
+        # joined last because Qt aborts if a QThread outlives the application
+        emulation_thread = self.emulation_thread
+        self.emulation_thread = None
+        if emulation_thread and emulation_thread.isRunning():
+            emulation_thread.stop(wait=False)
         
         # Clean up audio
-        if self.audio_output:
-            self.audio_output.stop()
-            self.audio_output = None
-        if self.audio_device:
-            self.audio_device = None
+        if self.audio_worker:
+            QMetaObject.invokeMethod(self.audio_worker, 'stop', Qt.BlockingQueuedConnection)
+            self.audio_thread.quit()
+            self.audio_thread.wait()
+            self.audio_worker = None
+            self.audio_source.close()
+        
+        if emulation_thread:
+            emulation_thread.wait()
         
         event.accept()
 
@@ -1913,11 +2579,25 @@ class NESendoGUI(QMainWindow):
 class AudioSettingsDialog(QDialog):
     """Dialog for configuring audio settings."""
     
+    # One period of the 441 Hz (near A4) test tone at 44.1 kHz, at 30% of
+    # the emulator's output level
+    TEST_TONE_PERIOD = (
+        np.sin(2 * np.pi * np.arange(100) / 100) * 0.3 * NESendoGUI.AUDIO_SCALE
+    ).astype(np.int16)
+    
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
         self.init_ui()
-        self.apply_dark_theme()
+        # The style sheet is applied on first show, see showEvent()
+        self._styled = False
+    
+    def showEvent(self, event):
+        """Apply the theme the first time the dialog is shown."""
+        if not self._styled:
+            self.apply_dark_theme()
+            self._styled = True
+        super().showEvent(event)
     
     def init_ui(self):
         """Initialize the audio settings dialog UI."""
@@ -2040,84 +2720,25 @@ class AudioSettingsDialog(QDialog):
         
         self.setLayout(layout)
     
+    def load_settings(self):
+        """Show the window's current audio settings."""
+        self.enable_audio_checkbox.setChecked(self.parent.audio_enabled)
+        self.master_volume_slider.setValue(int(self.parent.master_volume * 100))
+    
     def apply_dark_theme(self):
         """Apply dark theme to the dialog."""
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #0f1419;
-                color: #cbd5e0;
-            }
-            QGroupBox {
-                font-weight: bold;
-                font-size: 13px;
-                color: #cbd5e0;
-                border: 2px solid #2d3748;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-            QLabel {
-                color: #cbd5e0;
-                font-size: 12px;
-            }
-            QCheckBox {
-                color: #cbd5e0;
-                font-size: 12px;
-            }
-            QSlider::groove:horizontal {
-                border: 1px solid #2d3748;
-                height: 8px;
-                background: #1a202c;
-                border-radius: 4px;
-            }
-            QSlider::handle:horizontal {
-                background: #2d5a27;
-                border: 1px solid #2d5a27;
-                width: 18px;
-                margin: -5px 0;
-                border-radius: 9px;
-            }
-            QSlider::handle:horizontal:hover {
-                background: #1a3d1a;
-            }
-            QComboBox {
-                background-color: #1a202c;
-                border: 1px solid #2d3748;
-                border-radius: 4px;
-                color: #cbd5e0;
-                padding: 4px;
-                font-size: 12px;
-            }
-            QComboBox:hover {
-                border-color: #2d5a27;
-            }
-            QPushButton {
-                background-color: #2d3748;
-                border: 1px solid #2d3748;
-                color: #cbd5e0;
-                padding: 6px 12px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #2d5a27;
-            }
-        """)
+        self.setStyleSheet(_AUDIO_DIALOG_QSS)
     
     def test_audio(self):
         """Test audio output."""
         try:
-            # Generate a simple test tone (440 Hz sine wave)
+            # Repeat the precomputed sine period for 0.5 seconds
             sample_rate = 44100
             duration = 0.5  # 0.5 seconds
-            frequency = 440  # A4 note
             
-            t = np.linspace(0, duration, int(sample_rate * duration), False)
-            test_tone = np.sin(2 * np.pi * frequency * t) * 0.3  # 30% volume
+            n = int(sample_rate * duration)
+            period = self.TEST_TONE_PERIOD
+            test_tone = np.tile(period, n // len(period) + 1)[:n]
             
             # Play the test tone
             self.parent.play_audio(test_tone)
@@ -2134,9 +2755,17 @@ class StateManagerDialog(QDialog):
         super().__init__(parent)
         self.parent = parent
         self.init_ui()
-        self.apply_dark_theme()
+        # The style sheet is applied on first show, see showEvent()
+        self._styled = False
         self.load_state_info()
     
+    def showEvent(self, event):
+        """Apply the theme the first time the dialog is shown."""
+        if not self._styled:
+            self.apply_dark_theme()
+            self._styled = True
+        super().showEvent(event)
+    
     def init_ui(self):
         """Initialize the state manager dialog UI."""
         self.setWindowTitle("State Manager")
@@ -2146,10 +2775,17 @@ class StateManagerDialog(QDialog):
         layout = QVBoxLayout()
         
         # State slots table
-        self.state_table = QTextEdit()
-        self.state_table.setReadOnly(True)
+        self.state_table = QTableWidget(0, 3)
+        self.state_table.setHorizontalHeaderLabels(["Slot", "ROM", "Timestamp"])
+        self.state_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.state_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.state_table.verticalHeader().setVisible(False)
+        self.state_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.state_table.setSortingEnabled(True)
+        self.state_table.sortByColumn(0, Qt.AscendingOrder)
         self.state_table.setMaximumHeight(200)
-        layout.addWidget(QLabel("Saved States:"))
+        self.state_label = QLabel("Saved States:")
+        layout.addWidget(self.state_label)
         layout.addWidget(self.state_table)
         
         # Buttons
@@ -2159,6 +2795,10 @@ class StateManagerDialog(QDialog):
         refresh_button.clicked.connect(self.load_state_info)
         button_layout.addWidget(refresh_button)
         
+        export_button = QPushButton("Export All...")
+        export_button.clicked.connect(self.export_all_states)
+        button_layout.addWidget(export_button)
+        
         clear_all_button = QPushButton("Clear All")
         clear_all_button.clicked.connect(self.clear_all_states)
         button_layout.addWidget(clear_all_button)
@@ -2174,53 +2814,43 @@ class StateManagerDialog(QDialog):
     
     def apply_dark_theme(self):
         """Apply dark theme to the dialog."""
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #0f1419;
-                color: #cbd5e0;
-            }
-            QLabel {
-                color: #cbd5e0;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            QTextEdit {
-                background-color: #1a202c;
-                border: 1px solid #2d3748;
-                border-radius: 4px;
-                color: #cbd5e0;
-                font-size: 11px;
-                padding: 8px;
-            }
-            QPushButton {
-                background-color: #2d3748;
-                border: 1px solid #2d3748;
-                color: #cbd5e0;
-                padding: 6px 12px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #2d5a27;
-            }
-        """)
+        self.setStyleSheet(_STATE_DIALOG_QSS)
     
     def load_state_info(self):
         """Load and display state information."""
-        if not self.parent.state_slots:
-            self.state_table.setPlainText("No saved states found.")
-            return
-        
-        info_text = "Slot | ROM | Timestamp\n"
-        info_text += "-" * 50 + "\n"
-        
-        for slot in sorted(self.parent.state_slots.keys()):
-            state_data = self.parent.state_slots[slot]
+        slots = self.parent.state_slots
+        self.state_label.setText("Saved States:" if slots else "No saved states found.")
+        
+        # Fill the rows in slot order, reusing existing items, then re-sort
+        table = self.state_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(slots))
+        for row, (slot, state_data) in enumerate(sorted(slots.items())):
             rom_name = os.path.basename(state_data.get('rom_path', 'Unknown'))
             timestamp = state_data.get('timestamp', 0)
             time_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
-            info_text += f"{slot:4} | {rom_name:20} | {time_str}\n"
+            for column, value in enumerate((slot, rom_name, time_str)):
+                item = table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    table.setItem(row, column, item)
+                # Slot numbers are stored as ints so they sort numerically
+                item.setData(Qt.DisplayRole, value)
+        table.setSortingEnabled(True)
+    
+    def export_all_states(self):
+        """Export all saved state slots to a chosen directory."""
+        directory = QFileDialog.getExistingDirectory(
+            self, "Export States", self.parent.state_directory
+        )
+        if not directory:
+            return
         
-        self.state_table.setPlainText(info_text)
+        try:
+            count = self.parent.save_all_slots_to_dir(directory)
+            QMessageBox.information(self, "Export States", f"Exported {count} state(s) to {directory}.")
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export states: {str(e)}")
     
     def clear_all_states(self):
         """Clear all saved states."""
@@ -2242,6 +2872,11 @@ def main():
     os.environ['QT_LOGGING_RULES'] = 'qt.qpa.wayland.debug=false'
     os.environ['QT_QPA_PLATFORM'] = 'xcb'  # Force X11 backend to avoid Wayland issues
     
+    # Scale the UI on HiDPI screens and keep pixmaps at device resolution;
+    # both must be set before the QApplication is created
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    
     app = QApplication(sys.argv)
     
     # Set application properties
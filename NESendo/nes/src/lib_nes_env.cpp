@@ -18,8 +18,8 @@
     #define EXP __declspec(dllexport)
 // Unix-like systems
 #else
-    // setup the modifier as a dummy
-    #define EXP
+    // export explicitly, the library is built with -fvisibility=hidden
+    #define EXP __attribute__((visibility("default")))
 #endif
 
 // definitions of functions for the Python interface to access
@@ -18,7 +18,9 @@ _MODULE_PATH = os.path.dirname(__file__)
 _SO_PATH = 'lib_nes_env*'
 # the absolute path to the C++ shared object library
 _LIB_PATH = os.path.join(_MODULE_PATH, _SO_PATH)
-# load the library from the shared object file
+# load the library from the shared object file. ctypes.cdll releases the GIL
+# for the duration of every foreign call, so Step() runs in parallel with
+# any other Python thread (e.g., a GUI event loop) instead of blocking it
 try:
     _LIB = ctypes.cdll.LoadLibrary(glob.glob(_LIB_PATH)[0])
 except IndexError:
@@ -67,6 +69,9 @@ _LIB.GetAudioBufferSize.restype = ctypes.c_int
 # setup the argument and return types for GetAudioBuffer
 _LIB.GetAudioBuffer.argtypes = [ctypes.c_void_p]
 _LIB.GetAudioBuffer.restype = ctypes.POINTER(ctypes.c_float)
+# setup the argument and return types for GetAndClearAudioBuffer
+_LIB.GetAndClearAudioBuffer.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int]
+_LIB.GetAndClearAudioBuffer.restype = None
 # setup the argument and return types for ClearAudioBuffer
 _LIB.ClearAudioBuffer.argtypes = [ctypes.c_void_p]
 _LIB.ClearAudioBuffer.restype = None
@@ -465,19 +470,34 @@ class NESEnv(gym.Env):
         audio_data = np.ctypeslib.as_array(buffer_ptr, shape=(size,))
         return audio_data.copy()  # Return a copy to avoid memory issues
     
-    def get_and_clear_audio_buffer(self):
-        """Get and clear the audio buffer from the emulator."""
+    def get_and_clear_audio_buffer(self, out=None):
+        """Get and clear the audio buffer from the emulator.
+        
+        Args:
+            out (np.ndarray): an optional C-contiguous float32 buffer to copy
+              the samples into. a new array is allocated when omitted or too
+              small
+
+        Returns:
+            a float32 array of the samples, or None if the buffer is empty
+
+        """
+        # the samples are memcpy'd as raw floats, so anything else is garbage
+        if out is not None and (out.dtype != np.float32 or not out.flags['C_CONTIGUOUS']):
+            raise ValueError('out must be a C-contiguous float32 array')
         if not self._env:
             return None
         
-        # Get the current buffer
-        audio_data = self.get_audio_buffer()
+        size = _LIB.GetAudioBufferSize(self._env)
+        if size == 0:
+            return None
         
-        # Clear the buffer to prevent overflow
-        if audio_data is not None:
-            self.clear_audio_buffer()
+        # copy straight from the C++ buffer into the output array in one call
+        if out is None or len(out) < size:
+            out = np.empty(size, dtype=np.float32)
+        _LIB.GetAndClearAudioBuffer(self._env, out.ctypes.data, size)
         
-        return audio_data
+        return out[:size]
     
     def clear_audio_buffer(self):
         """Clear the audio buffer."""
@@ -1,38 +1,117 @@
 """The setup script for installing and distributing the NESendo package."""
 import os
-from glob import glob
-from setuptools import setup, find_packages, Extension
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from setuptools import setup, Extension
+from setuptools.command.build_ext import build_ext
 
 
-# set the compiler for the C++ framework
-os.environ['CC'] = 'g++'
+# set the compiler for the C++ framework, through ccache when it is installed
+# so that rebuilds of unchanged files are instant
+os.environ['CC'] = 'ccache g++' if shutil.which('ccache') else 'g++'
 os.environ['CCX'] = 'g++'
 
 
 # The prefix name for the .so library to build. It will follow the format
 # lib_nes_env.*.so where the * changes depending on the build system
 LIB_NAME = 'NESendo.lib_nes_env'
-# The source files for building the extension. Globs locate all the cpp files
-# used by the LaiNES subproject. MANIFEST.in has to include the blanket
-# "cpp" directory to ensure that the .inc file gets included too
-SOURCES = glob('NESendo/nes/src/*.cpp') + glob('NESendo/nes/src/mappers/*.cpp')
+# The source files for building the extension, listed explicitly so a build
+# does not walk the source tree; add new LaiNES files (e.g. mappers) here.
+# MANIFEST.in has to include the blanket "cpp" directory to ensure that the
+# .inc file gets included too
+SOURCES = [
+    'NESendo/nes/src/' + name for name in (
+        'apu.cpp',
+        'cartridge.cpp',
+        'controller.cpp',
+        'cpu.cpp',
+        'emulator.cpp',
+        'lib_nes_env.cpp',
+        'main_bus.cpp',
+        'picture_bus.cpp',
+        'ppu.cpp',
+        'mappers/mapper_CNROM.cpp',
+        'mappers/mapper_NROM.cpp',
+        'mappers/mapper_SxROM.cpp',
+        'mappers/mapper_UxROM.cpp',
+    )
+]
 # The directory pointing to header files used by the LaiNES cpp files.
 # This directory has to be included using MANIFEST.in too to include the
 # headers with sdist
 INCLUDE_DIRS = ['NESendo/nes/include']
-# Build arguments to pass to the compiler
-EXTRA_COMPILE_ARGS = ['-std=c++1y', '-pipe', '-O3']
+# Build arguments to pass to the compiler. Symbols are hidden by default (the
+# ctypes interface is exported explicitly with EXP in lib_nes_env.cpp), which
+# with link-time optimization lets the core be inlined across source files
+EXTRA_COMPILE_ARGS = [
+    '-std=c++1y', '-pipe', '-O3',
+    '-flto', '-funroll-loops', '-fno-plt',
+    '-fvisibility=hidden', '-fno-semantic-interposition',
+]
+# Set NESENDO_NATIVE=1 to tune for the build machine's CPU. This is off by
+# default so that distributed wheels run on any CPU of the target arch
+if os.environ.get('NESENDO_NATIVE') == '1':
+    EXTRA_COMPILE_ARGS += ['-march=native', '-mtune=native']
+# Build arguments to pass to the linker. LTO compiles at link time, so it
+# needs the optimization flags again
+EXTRA_LINK_ARGS = ['-O3', '-flto', '-funroll-loops'] + [
+    arg for arg in EXTRA_COMPILE_ARGS if arg.startswith(('-march', '-mtune'))
+]
+# macOS's linker does not understand these GNU ld options
+if sys.platform.startswith('linux'):
+    EXTRA_LINK_ARGS += ['-Wl,-O1,--as-needed']
 # The official extension using the name, source, headers, and build args
 LIB_NES_ENV = Extension(LIB_NAME,
     sources=SOURCES,
     include_dirs=INCLUDE_DIRS,
     extra_compile_args=EXTRA_COMPILE_ARGS,
+    extra_link_args=EXTRA_LINK_ARGS,
 )
 
 
+class ParallelBuildExt(build_ext):
+    """Compile the source files of each extension in parallel.
+
+    build_ext's own --parallel only builds separate extensions concurrently,
+    and there is just the one here. Extensions are built one at a time so the
+    compiler's compile method can be swapped safely, and each one's files are
+    compiled by a pool of --parallel / -j jobs (the number of CPUs by default).
+    """
+
+    def initialize_options(self):
+        super().initialize_options()
+        self.parallel = os.cpu_count() or 1
+
+    def build_extensions(self):
+        self.check_extensions_list(self.extensions)
+        compile_serial = self.compiler.compile
+        jobs = self.parallel if isinstance(self.parallel, int) else os.cpu_count() or 1
+
+        def compile_parallel(sources, *args, **kwargs):
+            # compile each file with its own call; the compiler runs in a
+            # subprocess, so threads are enough to keep the cores busy
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                objects = executor.map(
+                    lambda source: compile_serial([source], *args, **kwargs),
+                    sources,
+                )
+                return [obj for objs in objects for obj in objs]
+
+        # build serially, bypassing build_ext's per-extension thread pool
+        self.compiler.compile = compile_parallel
+        try:
+            for ext in self.extensions:
+                self.build_extension(ext)
+        finally:
+            self.compiler.compile = compile_serial
+
+
 setup(
     ext_modules=[LIB_NES_ENV],
-    packages=find_packages(exclude=['tests', '*.tests', '*.tests.*']),
+    cmdclass={'build_ext': ParallelBuildExt},
+    # the same explicit list as pyproject.toml, no package discovery walk
+    packages=['NESendo', 'NESendo.app'],
     zip_safe=False,
     entry_points={
         'console_scripts': [